@@ -1,28 +1,76 @@
+import click
 from flask import Flask
 from app.routes.home import home_bp
 from app.routes.register import register_bp
 from app.routes.booking import booking_bp
 import os
 
-def create_app():
-    app = Flask(__name__)
+def _loaded_by_cli_command():
+    """True se l'app è caricata da un comando flask diverso da 'flask run'"""
+    ctx = click.get_current_context(silent=True)
+    return ctx is not None and ctx.info_name != "run"
+
+def create_app(start_bot=None):
+    # Template minificati in build (minify_templates.py), se abilitati e presenti
+    from config import Config
+    template_folder = "templates"
+    if Config.MINIFIED_TEMPLATES:
+        if os.path.isdir(os.path.join(os.path.dirname(__file__), "templates_min")):
+            template_folder = "templates_min"
+
+    app = Flask(__name__, template_folder=template_folder)
     
     # Load config
     app.config.from_object('config.Config')
     app.secret_key = app.config.get('SECRET_KEY', 'supersecretkey')
 
+    # Compressione delle risposte e JSON veloce
+    from app.responses import init_responses
+    init_responses(app)
+
     # Initialize database
     from app.models import db
+    from app.database import configure_engine, engine_name, register_engine_events
+    configure_engine(app)
     db.init_app(app)
     
     with app.app_context():
+        for bind_key, engine in db.engines.items():
+            register_engine_events(app, engine, engine_name(bind_key))
         db.create_all()
 
+        from app.tenants import ensure_default_tenant, migrate_tenant_schema, tenant_schema_outdated
+        ensure_default_tenant()
+        if tenant_schema_outdated():
+            if db.engine.dialect.name == "sqlite":
+                # In locale c'è un solo processo: la migrazione è sicura all'avvio
+                migrate_tenant_schema()
+            elif _loaded_by_cli_command():
+                # Lascia girare 'flask tenant migrate' (e gli altri comandi)
+                print("⚠️ Schema precedente al multi-tenant: esegui 'flask tenant migrate'")
+            else:
+                raise RuntimeError(
+                    "Schema precedente al multi-tenant: esegui "
+                    "'flask --app run.py tenant migrate' prima di avviare l'app"
+                )
+
     # Register blueprints
     app.register_blueprint(home_bp)
     app.register_blueprint(register_bp)
     app.register_blueprint(booking_bp)
 
+    # Comandi CLI (flask data ..., flask tenant ...)
+    from app.cli import data_cli, tenant_cli
+    app.cli.add_command(data_cli)
+    app.cli.add_command(tenant_cli)
+
+    # I comandi CLI (export, migrate, ...) non devono avviare il bot né
+    # reimpostare i webhook: il polling consumerebbe gli update pendenti
+    if start_bot is None:
+        start_bot = not _loaded_by_cli_command()
+    if not start_bot:
+        return app
+
     # Determina se usare webhook o polling
     use_webhook = os.getenv("USE_WEBHOOK", "false").lower() == "true"
     
@@ -0,0 +1,229 @@
+# app/cli.py
+import csv
+import json
+import os
+import time
+from datetime import datetime
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import Boolean, DateTime, Integer, String, insert, select, text
+
+from app.models import db, Tenant, User, Booking, PromoCode
+
+# Modelli esportabili (l'ordine rispetta le foreign key per l'import)
+MODELS = {
+    "tenant": Tenant,
+    "user": User,
+    "booking": Booking,
+    "promo_code": PromoCode,
+}
+
+# Colonne escluse dall'export se non richieste con --include-secrets
+SECRET_COLUMNS = {
+    "tenant": {"bot_token"},
+}
+
+# NULL nei CSV (come COPY di Postgres), per distinguerlo dalla stringa vuota
+CSV_NULL = "\\N"
+
+data_cli = AppGroup("data", help="Esporta e importa i dati (CSV o JSONL).")
+tenant_cli = AppGroup("tenant", help="Gestisce le sedi (tenant) e i loro bot.")
+
+
+def _format_from_path(path, fmt):
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def _to_json(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _to_csv(value):
+    return CSV_NULL if value is None else _to_json(value)
+
+
+def _coerce(column, value):
+    """Converte un valore letto da CSV/JSONL nel tipo della colonna"""
+    if value is None or value == CSV_NULL:
+        return None
+    # La stringa vuota resta tale solo per le colonne di testo
+    if value == "" and not isinstance(column.type, String):
+        return None
+    if isinstance(column.type, Boolean):
+        return value if isinstance(value, bool) else str(value).lower() in ("1", "true", "t", "yes")
+    if isinstance(column.type, Integer):
+        return int(value)
+    if isinstance(column.type, DateTime):
+        return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+    return value
+
+
+def _report(label, rows, started):
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    click.echo(f"{label}: {rows} righe in {elapsed:.1f}s ({rows / elapsed:.0f} righe/s)")
+
+
+def _read_rows(path, fmt):
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _upsert_statement(table, columns):
+    """INSERT ... ON CONFLICT (id) DO UPDATE per Postgres e SQLite"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return insert(table)
+
+    stmt = dialect_insert(table)
+    pk = [c.name for c in table.primary_key.columns]
+    updates = {c.name: stmt.excluded[c.name] for c in columns if c.name not in pk}
+    return stmt.on_conflict_do_update(index_elements=pk, set_=updates)
+
+
+def _reset_sequence(table):
+    """Dopo un import con id espliciti riallinea la sequence di Postgres"""
+    if db.session.get_bind().dialect.name != "postgresql":
+        return
+    db.session.execute(text(
+        f"SELECT setval(pg_get_serial_sequence('\"{table.name}\"', 'id'), "
+        f"COALESCE((SELECT MAX(id) FROM \"{table.name}\"), 1))"
+    ))
+
+
+@data_cli.command("export")
+@click.argument("model", type=click.Choice(list(MODELS)))
+@click.argument("path", type=click.Path(dir_okay=False, writable=True))
+@click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]), help="Default: dall'estensione del file.")
+@click.option("--batch-size", default=1000, show_default=True, help="Righe lette per ogni fetch dal cursore.")
+@click.option("--include-secrets", is_flag=True, help="Esporta anche i token dei bot.")
+def export_data(model, path, fmt, batch_size, include_secrets):
+    """Esporta MODEL in PATH leggendo con un cursore lato server."""
+    table = MODELS[model].__table__
+    fmt = _format_from_path(path, fmt)
+    secrets = set() if include_secrets else SECRET_COLUMNS.get(model, set())
+    columns = [c for c in table.columns if c.name not in secrets]
+    names = [c.name for c in columns]
+
+    # Colonne Core (non oggetti ORM): nessuna identity map che cresce in memoria
+    stmt = select(*columns).order_by(table.c.id).execution_options(yield_per=batch_size)
+
+    started = time.perf_counter()
+    rows = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f) if fmt == "csv" else None
+        if writer:
+            writer.writerow(names)
+        for row in db.session.execute(stmt):
+            if writer:
+                writer.writerow(_to_csv(v) for v in row)
+            else:
+                f.write(json.dumps(dict(zip(names, map(_to_json, row))), ensure_ascii=False))
+                f.write("\n")
+            rows += 1
+    db.session.remove()
+
+    _report(f"Export {model}", rows, started)
+
+
+@data_cli.command("import")
+@click.argument("model", type=click.Choice(list(MODELS)))
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]), help="Default: dall'estensione del file.")
+@click.option("--batch-size", default=1000, show_default=True, help="Righe per ogni INSERT bulk.")
+@click.option("--upsert/--no-upsert", default=True, show_default=True, help="Aggiorna le righe con lo stesso id.")
+def import_data(model, path, fmt, batch_size, upsert):
+    """Importa MODEL da PATH con insert/upsert a blocchi."""
+    table = MODELS[model].__table__
+    fmt = _format_from_path(path, fmt)
+
+    started = time.perf_counter()
+    rows = 0
+    batch = []
+    columns = stmt = None
+    try:
+        for record in _read_rows(path, fmt):
+            if stmt is None:
+                # Le colonne presenti nel file si leggono dal primo record
+                columns = [c for c in table.columns if c.name in record]
+                stmt = _upsert_statement(table, columns) if upsert else insert(table)
+            batch.append({c.name: _coerce(c, record[c.name]) for c in columns})
+            if len(batch) >= batch_size:
+                db.session.execute(stmt, batch)
+                db.session.commit()
+                rows += len(batch)
+                batch = []
+        if batch:
+            db.session.execute(stmt, batch)
+            rows += len(batch)
+        _reset_sequence(table)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        db.session.remove()
+
+    _report(f"Import {model}", rows, started)
+
+
+@tenant_cli.command("create")
+@click.argument("slug")
+@click.option("--name", help="Nome della sede.")
+@click.option("--host", help="Dominio della sede, es. roma.gustinospa.it.")
+@click.option("--bot-token", required=True, help="Token del bot Telegram della sede.")
+@click.option("--bot-username", help="Username del bot Telegram.")
+@click.option("--owner-chat-id", help="Chat ID del titolare della sede.")
+@click.option("--special-code", help="Codice promo speciale della sede.")
+def create_tenant(slug, name, host, bot_token, bot_username, owner_chat_id, special_code):
+    """Crea la sede SLUG e, in modalità webhook, registra il suo webhook."""
+    if Tenant.query.filter_by(slug=slug).first():
+        raise click.ClickException(f"Il tenant {slug} esiste già")
+
+    tenant = Tenant(
+        slug=slug,
+        name=name or slug,
+        host=host.lower() if host else None,
+        bot_token=bot_token,
+        bot_username=bot_username,
+        owner_chat_id=owner_chat_id,
+        special_code=special_code,
+    )
+    db.session.add(tenant)
+    db.session.commit()
+    click.echo(f"Tenant {slug} creato (id={tenant.id})")
+    # Gli altri processi vedono il nuovo dominio entro TENANT_CACHE_SECONDS
+    from app.tenants import clear_tenant_cache
+    clear_tenant_cache()
+
+    if os.getenv("USE_WEBHOOK", "false").lower() == "true":
+        from app.telegram_webhook import set_tenant_webhook
+        set_tenant_webhook(tenant)
+
+
+@tenant_cli.command("migrate")
+def migrate_tenants():
+    """Aggiorna le tabelle create prima del multi-tenant."""
+    from app.tenants import migrate_tenant_schema
+    migrated = migrate_tenant_schema()
+    click.echo(f"Tabelle migrate: {', '.join(migrated)}" if migrated else "Schema già aggiornato")
+
+
+@tenant_cli.command("list")
+def list_tenants():
+    """Elenca le sedi configurate."""
+    for tenant in Tenant.query.order_by(Tenant.id):
+        click.echo(f"{tenant.id}\t{tenant.slug}\t{tenant.host or '-'}\t@{tenant.bot_username or '-'}")
@@ -0,0 +1,157 @@
+# app/database.py
+import threading
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# Contatori dei pool di connessioni, uno per engine (aggiornati dagli eventi del pool)
+pool_metrics = {}
+_metrics_lock = threading.Lock()
+
+
+def _new_metrics():
+    return {
+        "connects": 0,
+        "checkouts": 0,
+        "checkins": 0,
+        "invalidations": 0,
+        "checked_out": 0,
+        "peak_checked_out": 0,
+    }
+
+
+def engine_name(bind_key):
+    """Nome dell'engine nelle metriche: primary o il bind della replica"""
+    return bind_key or "primary"
+
+
+def _is_sqlite(uri):
+    return make_url(uri).get_backend_name() == "sqlite"
+
+
+def _is_sqlite_memory(uri):
+    url = make_url(uri)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def build_engine_options(config, uri=None):
+    """Costruisce SQLALCHEMY_ENGINE_OPTIONS a partire dalla Config"""
+    uri = uri or config["SQLALCHEMY_DATABASE_URI"]
+    options = {"pool_pre_ping": config.get("DB_POOL_PRE_PING", True)}
+
+    # SQLite in memoria usa uno StaticPool: niente dimensionamento del pool
+    if not _is_sqlite_memory(uri):
+        options.update({
+            "pool_size": config.get("DB_POOL_SIZE", 5),
+            "max_overflow": config.get("DB_MAX_OVERFLOW", 10),
+            "pool_timeout": config.get("DB_POOL_TIMEOUT", 30),
+            "pool_recycle": config.get("DB_POOL_RECYCLE", 280),
+        })
+
+    if _is_sqlite(uri):
+        # Il timeout del driver sqlite3 è in secondi
+        busy_timeout_ms = config.get("SQLITE_BUSY_TIMEOUT_MS", 5000)
+        options["connect_args"] = {"timeout": busy_timeout_ms / 1000}
+
+    return options
+
+
+def configure_engine(app):
+    """Imposta le opzioni dell'engine prima di db.init_app(app)"""
+    options = build_engine_options(app.config)
+    # Le opzioni esplicite nella config hanno la precedenza
+    options.update(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+
+    # Ogni replica diventa un bind con le proprie opzioni (es. SQLite vs Postgres)
+    from app.db_routing import REPLICA_BIND_PREFIX
+    binds = dict(app.config.get("SQLALCHEMY_BINDS") or {})
+    for i, url in enumerate(app.config.get("DATABASE_REPLICA_URLS") or []):
+        binds[f"{REPLICA_BIND_PREFIX}{i}"] = {"url": url, **build_engine_options(app.config, url)}
+    app.config["SQLALCHEMY_BINDS"] = binds
+
+
+def _set_sqlite_pragmas(dbapi_connection, config):
+    cursor = dbapi_connection.cursor()
+    try:
+        if config.get("SQLITE_WAL", True):
+            # WAL: i lettori non bloccano lo scrittore e viceversa
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(config.get('SQLITE_BUSY_TIMEOUT_MS', 5000))}")
+        synchronous = config.get("SQLITE_SYNCHRONOUS", "NORMAL")
+        if synchronous in ("OFF", "NORMAL", "FULL", "EXTRA"):
+            cursor.execute(f"PRAGMA synchronous={synchronous}")
+        if config.get("SQLITE_FOREIGN_KEYS", False):
+            cursor.execute("PRAGMA foreign_keys=ON")
+    finally:
+        cursor.close()
+
+
+def register_engine_events(app, engine, name="primary"):
+    """Registra PRAGMA SQLite e metriche del pool sull'engine"""
+    config = app.config
+    with _metrics_lock:
+        metrics = pool_metrics.setdefault(name, _new_metrics())
+
+    if engine.dialect.name == "sqlite":
+        @event.listens_for(engine, "connect")
+        def on_sqlite_connect(dbapi_connection, connection_record):
+            _set_sqlite_pragmas(dbapi_connection, config)
+
+        @event.listens_for(engine, "checkin")
+        def on_sqlite_checkin(dbapi_connection, connection_record):
+            # Rimuove l'eventuale statement timeout impostato da db_routing
+            if dbapi_connection is not None:
+                dbapi_connection.set_progress_handler(None, 0)
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        with _metrics_lock:
+            metrics["connects"] += 1
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        with _metrics_lock:
+            metrics["checkouts"] += 1
+            metrics["checked_out"] += 1
+            if metrics["checked_out"] > metrics["peak_checked_out"]:
+                metrics["peak_checked_out"] = metrics["checked_out"]
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        with _metrics_lock:
+            metrics["checkins"] += 1
+            metrics["checked_out"] = max(0, metrics["checked_out"] - 1)
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        with _metrics_lock:
+            metrics["invalidations"] += 1
+
+
+def get_pool_stats(engine, name="primary"):
+    """Ritorna lo stato del pool e i contatori raccolti per l'engine"""
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__, "status": pool.status()}
+
+    # size/overflow esistono solo su QueuePool
+    if hasattr(pool, "size") and hasattr(pool, "overflow"):
+        size = pool.size()
+        stats.update({
+            "size": size,
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "max_overflow": getattr(pool, "_max_overflow", None),
+        })
+        capacity = size + max(stats["max_overflow"] or 0, 0)
+        if capacity:
+            stats["utilization"] = round(pool.checkedout() / capacity, 3)
+
+    with _metrics_lock:
+        stats["metrics"] = dict(pool_metrics.get(name) or _new_metrics())
+    return stats
+
+
+def get_all_pool_stats(engines):
+    """Stato di tutti i pool (primario e repliche), indicizzato per nome"""
+    return {engine_name(key): get_pool_stats(engine, engine_name(key)) for key, engine in engines.items()}
@@ -0,0 +1,101 @@
+# app/db_routing.py
+import random
+import time
+from functools import wraps
+
+from flask import current_app, g, has_app_context, has_request_context, request, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+# I bind delle repliche si chiamano replica_0, replica_1, ...
+REPLICA_BIND_PREFIX = "replica_"
+
+# Chiave nella sessione Flask per la stickiness read-your-writes
+STICKY_SESSION_KEY = "_db_primary_until"
+
+
+def read_only(statement_timeout_ms=None):
+    """Decoratore per route di sola lettura.
+
+    Le richieste GET/HEAD vengono servite dalle repliche (se configurate) e
+    ogni transazione ha uno statement timeout, così una query lenta non
+    blocca un worker.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            g.db_read_only = request.method in ("GET", "HEAD")
+            g.db_statement_timeout_ms = (
+                statement_timeout_ms
+                if statement_timeout_ms is not None
+                else current_app.config.get("DB_READ_STATEMENT_TIMEOUT_MS")
+            )
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _replica_keys(engines):
+    return [key for key in engines if isinstance(key, str) and key.startswith(REPLICA_BIND_PREFIX)]
+
+
+def _use_replica():
+    if not has_app_context() or not g.get("db_read_only"):
+        return False
+    if g.get("db_sticky_primary"):
+        return False
+    # Read-your-writes: dopo un commit l'utente legge dal primario per qualche secondo
+    if has_request_context() and session.get(STICKY_SESSION_KEY, 0) > time.time():
+        return False
+    return True
+
+
+class RoutingSession(Session):
+    """Session che invia le letture delle route read_only alle repliche"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and _use_replica():
+            replicas = _replica_keys(self._db.engines)
+            if replicas:
+                return self._db.engines[random.choice(replicas)]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_writes(db_session, flush_context):
+    db_session.info["has_writes"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _stick_to_primary(db_session):
+    if not db_session.info.pop("has_writes", False) or not has_app_context():
+        return
+    g.db_sticky_primary = True
+    if has_request_context():
+        seconds = current_app.config.get("DB_REPLICA_STICKY_SECONDS", 5)
+        session[STICKY_SESSION_KEY] = time.time() + seconds
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_writes(db_session):
+    db_session.info.pop("has_writes", None)
+
+
+@event.listens_for(RoutingSession, "after_begin")
+def _apply_statement_timeout(db_session, transaction, connection):
+    if not has_app_context():
+        return
+    timeout_ms = g.get("db_statement_timeout_ms")
+    if not timeout_ms:
+        return
+
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        # SET LOCAL vale solo per la transazione corrente
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+    elif dialect == "sqlite":
+        # SQLite non ha statement_timeout: interrompe la query dopo la scadenza.
+        # L'handler viene rimosso al checkin della connessione (app/database.py)
+        deadline = time.monotonic() + timeout_ms / 1000
+        dbapi_connection = connection.connection.dbapi_connection
+        dbapi_connection.set_progress_handler(lambda: time.monotonic() > deadline, 1000)
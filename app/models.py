@@ -1,17 +1,37 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from app.db_routing import RoutingSession
 
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+class Tenant(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    slug = db.Column(db.String(50), unique=True, nullable=False)
+    name = db.Column(db.String(100))
+    # Dominio della sede (es. roma.gustinospa.it), usato per risolvere il tenant
+    host = db.Column(db.String(255), unique=True)
+    bot_token = db.Column(db.String(100))
+    bot_username = db.Column(db.String(100))
+    owner_chat_id = db.Column(db.String(50))
+    special_code = db.Column(db.String(50))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    chat_id = db.Column(db.String(50), unique=True, nullable=False)
+    tenant_id = db.Column(db.Integer, db.ForeignKey('tenant.id'), nullable=False)
+    chat_id = db.Column(db.String(50), nullable=False)
     name = db.Column(db.String(100))
     code_used = db.Column(db.String(50))
 
+    __table_args__ = (
+        db.Index('ix_user_tenant_chat_id', 'tenant_id', 'chat_id', unique=True),
+        db.Index('ix_user_tenant_code_used', 'tenant_id', 'code_used'),
+    )
+
 class Booking(db.Model):
     id = db.Column(db.Integer, primary_key=True)
+    tenant_id = db.Column(db.Integer, db.ForeignKey('tenant.id'), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     date = db.Column(db.String(50))
     time = db.Column(db.String(50))
@@ -19,9 +39,19 @@ class Booking(db.Model):
 
     user = db.relationship('User', backref=db.backref('bookings', lazy=True))
 
+    __table_args__ = (
+        db.Index('ix_booking_tenant_user_id', 'tenant_id', 'user_id'),
+    )
+
 
 class PromoCode(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    code = db.Column(db.String(50), unique=True, nullable=False)
+    tenant_id = db.Column(db.Integer, db.ForeignKey('tenant.id'), nullable=False)
+    code = db.Column(db.String(50), nullable=False)
     used = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_promo_code_tenant_code', 'tenant_id', 'code', unique=True),
+    )
+
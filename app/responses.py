@@ -0,0 +1,118 @@
+# app/responses.py
+import gzip
+
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+
+# Dipendenze opzionali: senza brotli si usa solo gzip, senza orjson il json standard
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+COMPRESSIBLE_MIMETYPES = {
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+}
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider basato su orjson: serializza direttamente in bytes.
+
+    Le chiamate con argomenti specifici del modulo json (es. object_hook del
+    serializzatore della sessione Flask) passano al provider standard.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, default=self.default), mimetype=self.mimetype)
+
+
+def _accepted_encodings():
+    """Ritorna le codifiche accettate dal client (q=0 esclude la codifica)"""
+    accepted = set()
+    for item in request.headers.get("Accept-Encoding", "").split(","):
+        parts = item.strip().split(";")
+        name = parts[0].strip().lower()
+        quality = next((p.strip()[2:] for p in parts[1:] if p.strip().startswith("q=")), "1")
+        try:
+            if name and float(quality) > 0:
+                accepted.add(name)
+        except ValueError:
+            continue
+    return accepted
+
+
+def _choose_encoding():
+    accepted = _accepted_encodings()
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress_response(response, config):
+    """Comprime la risposta con brotli o gzip secondo Accept-Encoding"""
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+
+    data = response.get_data()
+    if len(data) < config.get("COMPRESS_MIN_SIZE", 500):
+        return response
+
+    encoding = _choose_encoding()
+    if encoding == "br":
+        compressed = brotli.compress(data, quality=config.get("COMPRESS_BR_QUALITY", 4))
+    elif encoding == "gzip":
+        compressed = gzip.compress(data, compresslevel=config.get("COMPRESS_LEVEL", 6))
+    else:
+        return response
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def init_responses(app):
+    """Registra compressione e JSON provider veloce sull'app"""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+    else:
+        # Niente ordinamento delle chiavi né indentazione nelle API
+        app.json.sort_keys = False
+        app.json.compact = True
+
+    if app.config.get("COMPRESS_RESPONSES", True):
+        @app.after_request
+        def _compress(response):
+            return compress_response(response, app.config)
@@ -1,14 +1,17 @@
-from flask import Blueprint, render_template, request, redirect, flash, current_app
+from flask import Blueprint, render_template, request, redirect, flash
 from datetime import datetime
 from app.models import Booking, User, db
+from app.db_routing import read_only
 from app.telegram_utils import tg_send
-from config import Config
+from app.tenants import current_tenant, tenant_query
 
 booking_bp = Blueprint('booking_bp', __name__)
 
 @booking_bp.route('/booking/<int:user_id>', methods=['GET', 'POST'])
+@read_only()
 def booking(user_id):
-    user = User.query.get(user_id)
+    tenant = current_tenant()
+    user = tenant_query(User).filter_by(id=user_id).first()
     
     if not user:
         flash("Utente non trovato.")
@@ -18,7 +21,7 @@ def booking(user_id):
         date = request.form.get('date')
         time = request.form.get('time')
 
-        booking = Booking(user_id=user.id, date=date, time=time)
+        booking = Booking(tenant_id=tenant.id, user_id=user.id, date=date, time=time)
         db.session.add(booking)
         db.session.commit()
 
@@ -33,7 +36,7 @@ def booking(user_id):
         tg_send(user.chat_id, user_message)
         
         # Invia copia all'owner (con tutti i dettagli)
-        owner_chat = current_app.config.get('OWNER_CHAT_ID')
+        owner_chat = tenant.owner_chat_id
         if owner_chat:
             owner_message = (
                 f"🔔 Nuova prenotazione!\n\n"
@@ -46,4 +49,4 @@ def booking(user_id):
         flash("✅ Prenotazione completata! Riceverai una conferma su Telegram.")
         return redirect(f'/booking/{user.id}')
     
-    return render_template('booking.html', user=user, special_code=Config.SPECIAL_CODE)
+    return render_template('booking.html', user=user, special_code=tenant.special_code)
@@ -1,7 +1,10 @@
 from flask import Blueprint, render_template, redirect, url_for, jsonify, request
 import app.telegram_polling as telegram_polling  # importa il modulo intero
-from app.models import User, db, Booking
+from app.models import User, db, Booking, PromoCode
+from app.db_routing import read_only
+from app.tenants import current_tenant, tenant_query
 from config import Config
+import hmac
 import os
 
 home_bp = Blueprint("home_bp", __name__)
@@ -16,19 +19,20 @@ def home():
 
 # Endpoint per verificare se un codice promo esiste già
 @home_bp.route("/check-promo-code")
+@read_only()
 def check_promo_code():
     code = request.args.get('code', '').strip().upper()
     if not code:
         return jsonify({"exists": False})
     
     # Cerca utente con questo codice
-    user = User.query.filter_by(code_used=code).first()
+    user = tenant_query(User).filter_by(code_used=code).first()
     if user:
         return jsonify({
             "exists": True,
             "user_id": user.id,
             "user_name": user.name,
-            "is_special": user.code_used == Config.SPECIAL_CODE
+            "is_special": user.code_used == current_tenant().special_code
         })
     
     return jsonify({"exists": False})
@@ -41,7 +45,7 @@ def start_bot():
     
     # Se c'è un promo_code, verifica se l'utente esiste già
     if promo_code:
-        user = User.query.filter_by(code_used=promo_code.upper()).first()
+        user = tenant_query(User).filter_by(code_used=promo_code.upper()).first()
         if user and user.chat_id:
             # Se ha nome, promo e chat_id --> vai al booking
             if user.name:
@@ -73,15 +77,17 @@ def start_bot():
 # Pagina di attesa per ottenere chat_id
 @home_bp.route("/wait-for-chatid")
 def wait_for_chatid():
-    return render_template("wait_for_chatid.html")
+    bot_username = current_tenant().bot_username or Config.TELEGRAM_BOT_USERNAME
+    return render_template("wait_for_chatid.html", bot_username=bot_username)
 
 # Endpoint AJAX per verificare se il bot ha ricevuto un messaggio (usato dal frontend)
 @home_bp.route("/check-chatid")
+@read_only()
 def check_chatid():
     if USE_WEBHOOK:
         # Modalità webhook
         from app.telegram_webhook import get_latest_chat_id
-        chat_id = get_latest_chat_id()
+        chat_id = get_latest_chat_id(current_tenant().slug)
         print(f"🔍 [WEBHOOK] check_chatid chiamato - chat_id: {chat_id}")
     else:
         # Modalità polling
@@ -94,36 +100,34 @@ def check_chatid():
         return jsonify({"chat_id": None})
     
     # Controlla se l'utente esiste già (ritorno cliente)
-    existing_user = User.query.filter_by(chat_id=str(chat_id)).first()
+    existing_user = tenant_query(User).filter_by(chat_id=str(chat_id)).first()
     if existing_user:
         return jsonify({
             "chat_id": chat_id,
             "existing_user": True,
             "user_id": existing_user.id,
             "user_name": existing_user.name,
-            "is_special": existing_user.code_used == Config.SPECIAL_CODE
+            "is_special": existing_user.code_used == current_tenant().special_code
         })
     
     return jsonify({"chat_id": chat_id, "existing_user": False})
 
-# Endpoint per resettare il database (solo per sviluppo)
+# Endpoint per resettare i dati della sede corrente (solo per sviluppo)
 @home_bp.route("/reset-db")
 def reset_db():
     try:
-        # Elimina tutte le tabelle
-        db.drop_all()
-        db.session.commit()
-        
-        # Ricrea tutte le tabelle
-        db.create_all()
+        # Elimina solo i dati della sede corrente: le altre sedi e i tenant restano
+        tenant = current_tenant()
+        for model in (Booking, PromoCode, User):
+            model.query.filter_by(tenant_id=tenant.id).delete(synchronize_session=False)
         db.session.commit()
 
         # Reset chat_id in base alla modalità
         if USE_WEBHOOK:
-            # Modalità webhook: pulisci pending_chat_ids
+            # Modalità webhook: pulisci i pending_chat_ids della sede
             from app.telegram_webhook import pending_chat_ids
-            pending_chat_ids.clear()
-            print("🧹 pending_chat_ids pulito (modalità webhook)")
+            pending_chat_ids.pop(tenant.slug, None)
+            print(f"🧹 pending_chat_ids di {tenant.slug} pulito (modalità webhook)")
         else:
             # Modalità polling: reset chat_id_global
             telegram_polling.chat_id_global = None
@@ -131,7 +135,7 @@ def reset_db():
         
         return jsonify({
             "success": True,
-            "message": "Database resettato e ricreato con successo"
+            "message": f"Dati della sede {tenant.slug} eliminati con successo"
         })
     except Exception as e:
         db.session.rollback()
@@ -139,3 +143,13 @@ def reset_db():
             "success": False,
             "error": str(e)
         }), 500
+
+# Endpoint per monitorare il pool di connessioni del database (richiede ADMIN_KEY)
+@home_bp.route("/db-stats")
+def db_stats():
+    key = request.headers.get("X-Admin-Key") or request.args.get("key", "")
+    if not hmac.compare_digest(key.encode(), Config.ADMIN_KEY.encode()):
+        return jsonify({"error": "Unauthorized"}), 403
+
+    from app.database import get_all_pool_stats
+    return jsonify(get_all_pool_stats(db.engines))
@@ -1,23 +1,24 @@
 from flask import Blueprint, request, render_template, redirect, flash, current_app, url_for
 from app.models import User, db
 from app.telegram_utils import tg_send
-from config import Config
+from app.tenants import current_tenant, tenant_query
 
 register_bp = Blueprint("register_bp", __name__)
 
 @register_bp.route("/register", methods=["GET", "POST"])
 def register():
+    tenant = current_tenant()
     promo = request.args.get('promo_code')
     chat_id = request.args.get('chat_id')
 
     # Se il promo è speciale, redirect alla pagina premio
-    if promo == Config.SPECIAL_CODE and request.method == 'GET':
+    if promo == tenant.special_code and request.method == 'GET':
         return redirect(url_for('register_bp.special_prize', chat_id=chat_id, promo_code=promo))
 
     if request.method == 'GET':
         user = None
         if chat_id:
-            user = User.query.filter_by(chat_id=str(chat_id)).first()
+            user = tenant_query(User).filter_by(chat_id=str(chat_id)).first()
             if not user:
                 # lightweight object for template when user not yet persisted
                 class TempUser:
@@ -26,7 +27,7 @@ def register():
                         self.name = None
                         self.id = None
                 user = TempUser(chat_id)
-        return render_template('registration.html', user=user, bot_username=current_app.config.get('TELEGRAM_BOT_USERNAME', 'GustinoSpa_bot'))
+        return render_template('registration.html', user=user, bot_username=tenant.bot_username or current_app.config.get('TELEGRAM_BOT_USERNAME', 'GustinoSpa_bot'))
 
     # POST - save or update user
     name = request.form.get('name')
@@ -37,9 +38,9 @@ def register():
         flash('Chat ID mancante. Apri il bot e riprova.')
         return redirect('/')
 
-    user = User.query.filter_by(chat_id=str(chat_id)).first()
+    user = tenant_query(User).filter_by(chat_id=str(chat_id)).first()
     if not user:
-        user = User(chat_id=str(chat_id), name=name, code_used=promo)
+        user = User(tenant_id=tenant.id, chat_id=str(chat_id), name=name, code_used=promo)
         db.session.add(user)
     else:
         user.name = name
@@ -50,7 +51,7 @@ def register():
 
     # invia messaggi su Telegram: all'utente e copia all'owner
     tg_send(user.chat_id, f"Ciao {user.name}, registrazione completata! Torna sul sito per prenotare.")
-    owner_chat = current_app.config.get('OWNER_CHAT_ID')
+    owner_chat = tenant.owner_chat_id
     if owner_chat:
         tg_send(owner_chat, f"{user.name} si è registrato. Promo: {promo or 'N/A'} - chat_id: {user.chat_id}")
 
@@ -59,6 +60,7 @@ def register():
 
 @register_bp.route("/special-prize", methods=["GET", "POST"])
 def special_prize():
+    tenant = current_tenant()
     promo = request.args.get('promo_code') or request.form.get('promo_code')
     chat_id = request.args.get('chat_id') or request.form.get('chat_id')
 
@@ -73,9 +75,9 @@ def special_prize():
         flash('Chat ID mancante. Apri il bot e riprova.')
         return redirect('/')
 
-    user = User.query.filter_by(chat_id=str(chat_id)).first()
+    user = tenant_query(User).filter_by(chat_id=str(chat_id)).first()
     if not user:
-        user = User(chat_id=str(chat_id), name=name, code_used=promo)
+        user = User(tenant_id=tenant.id, chat_id=str(chat_id), name=name, code_used=promo)
         db.session.add(user)
     else:
         user.name = name
@@ -96,12 +98,12 @@ def special_prize():
     tg_send(user.chat_id, special_message)
 
     # Messaggio all'owner
-    owner_chat = current_app.config.get('OWNER_CHAT_ID')
+    owner_chat = tenant.owner_chat_id
     if owner_chat:
         owner_message = (
             f"⭐ PRIMO CLIENTE REGISTRATO! 🎉\n\n"
             f"👤 Nome: {user.name}\n"
-            f"🎟️ Codice: {Config.SPECIAL_CODE}\n"
+            f"🎟️ Codice: {tenant.special_code}\n"
             f"🎁 Premio: Massaggi ILLIMITATI PER SEMPRE\n"
             f"📅 Valido: Per ogni volta che lo vorrai"
         )
@@ -2,12 +2,16 @@
 import requests
 from flask import current_app
 
-def tg_send(chat_id, text):
+def tg_send(chat_id, text, token=None):
     if not chat_id:
         current_app.logger.warning("Cannot send Telegram message: chat_id is None")
         return
 
-    token = current_app.config.get("TELEGRAM_BOT_TOKEN")
+    if not token:
+        # Bot del tenant corrente, altrimenti quello della Config
+        from app.tenants import current_tenant
+        tenant = current_tenant()
+        token = (tenant and tenant.bot_token) or current_app.config.get("TELEGRAM_BOT_TOKEN")
     if not token:
         current_app.logger.error("TELEGRAM_BOT_TOKEN not set")
         return
@@ -1,7 +1,10 @@
 import telebot
 import os
-from flask import request, jsonify, Blueprint
+from flask import request, jsonify, Blueprint, g
 from dotenv import load_dotenv
+from app.models import Tenant
+from app.tenants import get_bot
+from config import Config
 
 load_dotenv()
 
@@ -13,9 +16,20 @@ if not TOKEN:
 
 bot = telebot.TeleBot(TOKEN)
 
-# Cache temporanea per chat_id (invece di variabile globale)
+# Cache temporanea per chat_id, separata per tenant: {slug: {chat_id: timestamp}}
 pending_chat_ids = {}
 
+def _remember_chat_id(tenant_slug, chat_id):
+    """Salva il chat_id del tenant e pulisce quelli vecchi (oltre 10 minuti)"""
+    import time
+    tenant_chat_ids = pending_chat_ids.setdefault(tenant_slug, {})
+    tenant_chat_ids[chat_id] = time.time()
+
+    current_time = time.time()
+    to_remove = [cid for cid, timestamp in tenant_chat_ids.items() if current_time - timestamp > 600]
+    for cid in to_remove:
+        del tenant_chat_ids[cid]
+
 # IMPORTANTE: Registra l'handler PRIMA di creare le route
 @bot.message_handler(func=lambda message: True)
 def handle_message(message):
@@ -24,17 +38,10 @@ def handle_message(message):
     print(f"🔔 Webhook: Messaggio ricevuto da chat_id: {chat_id}")
     
     # Salva in cache temporanea con timestamp
-    import time
-    pending_chat_ids[chat_id] = time.time()
+    _remember_chat_id(Config.DEFAULT_TENANT_SLUG, chat_id)
     
     print(f"💾 pending_chat_ids: {pending_chat_ids}")
     
-    # Pulisci chat_id vecchi (oltre 10 minuti)
-    current_time = time.time()
-    to_remove = [cid for cid, timestamp in pending_chat_ids.items() if current_time - timestamp > 600]
-    for cid in to_remove:
-        del pending_chat_ids[cid]
-    
     if message.text and message.text.startswith('/start'):
         bot.reply_to(message, "Ciao! Torna sul sito per completare la registrazione.")
     else:
@@ -45,7 +52,21 @@ webhook_bp = Blueprint('webhook_bp', __name__)
 
 @webhook_bp.route('/telegram-webhook', methods=['POST'])
 def webhook():
-    print(f"📥 Webhook chiamato - Content-Type: {request.headers.get('content-type')}")
+    return _process_update(Config.DEFAULT_TENANT_SLUG, bot)
+
+@webhook_bp.route('/telegram-webhook/<slug>', methods=['POST'])
+def tenant_webhook(slug):
+    tenant = Tenant.query.filter_by(slug=slug).first()
+    if not tenant or not tenant.bot_token:
+        print(f"⚠️ Tenant sconosciuto o senza bot: {slug}")
+        return jsonify({"error": "Unknown tenant"}), 404
+
+    g.tenant = tenant
+    return _process_update(tenant.slug, get_bot(tenant.bot_token))
+
+def _process_update(tenant_slug, tenant_bot):
+    """Elabora un update Telegram per il tenant indicato"""
+    print(f"📥 Webhook chiamato [{tenant_slug}] - Content-Type: {request.headers.get('content-type')}")
     
     if request.headers.get('content-type') == 'application/json':
         json_string = request.get_data().decode('utf-8')
@@ -60,22 +81,15 @@ def webhook():
             print(f"🔍 Message trovato: chat_id={chat_id}, text={update.message.text}")
             
             # Elabora direttamente il messaggio invece di usare process_new_updates
-            import time
-            pending_chat_ids[chat_id] = time.time()
+            _remember_chat_id(tenant_slug, chat_id)
             print(f"💾 Chat ID salvato! pending_chat_ids: {pending_chat_ids}")
             
-            # Pulisci chat_id vecchi (oltre 10 minuti)
-            current_time = time.time()
-            to_remove = [cid for cid, timestamp in pending_chat_ids.items() if current_time - timestamp > 600]
-            for cid in to_remove:
-                del pending_chat_ids[cid]
-            
             # Rispondi al messaggio
             try:
                 if update.message.text and update.message.text.startswith('/start'):
-                    bot.send_message(chat_id, "Ciao! Torna sul sito per completare la registrazione.")
+                    tenant_bot.send_message(chat_id, "Ciao! Torna sul sito per completare la registrazione.")
                 else:
-                    bot.send_message(chat_id, "Messaggio ricevuto! Torna sul sito per continuare.")
+                    tenant_bot.send_message(chat_id, "Messaggio ricevuto! Torna sul sito per continuare.")
                 print(f"✅ Risposta inviata a {chat_id}")
             except Exception as e:
                 print(f"⚠️ Errore invio risposta: {e}")
@@ -104,18 +118,41 @@ def setup_webhook(app):
             print(f"✅ Webhook impostato: {webhook_url} - Result: {result}")
         except Exception as e:
             print(f"⚠️ Errore impostazione webhook: {e}")
+
+        # Webhook delle altre sedi, un path per tenant
+        with app.app_context():
+            tenants = Tenant.query.filter(
+                Tenant.slug != Config.DEFAULT_TENANT_SLUG,
+                Tenant.bot_token.isnot(None),
+            ).all()
+            for tenant in tenants:
+                set_tenant_webhook(tenant)
     
     return bot
 
-def get_latest_chat_id():
-    """Ritorna l'ultimo chat_id ricevuto"""
-    if not pending_chat_ids:
+def set_tenant_webhook(tenant):
+    """Imposta il webhook Telegram del bot di un tenant"""
+    if not WEBHOOK_URL or not tenant.bot_token:
+        return False
+    webhook_url = f"{WEBHOOK_URL}/telegram-webhook/{tenant.slug}"
+    try:
+        result = get_bot(tenant.bot_token).set_webhook(url=webhook_url)
+        print(f"✅ Webhook tenant {tenant.slug} impostato: {webhook_url} - Result: {result}")
+        return result
+    except Exception as e:
+        print(f"⚠️ Errore impostazione webhook tenant {tenant.slug}: {e}")
+        return False
+
+def get_latest_chat_id(tenant_slug=None):
+    """Ritorna l'ultimo chat_id ricevuto dal bot del tenant"""
+    tenant_chat_ids = pending_chat_ids.get(tenant_slug or Config.DEFAULT_TENANT_SLUG)
+    if not tenant_chat_ids:
         return None
     
     # Pulisci vecchi
     import time
     current_time = time.time()
-    valid_ids = {cid: ts for cid, ts in pending_chat_ids.items() if current_time - ts < 600}
+    valid_ids = {cid: ts for cid, ts in tenant_chat_ids.items() if current_time - ts < 600}
     
     # Ritorna il più recente
     if valid_ids:
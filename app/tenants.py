@@ -0,0 +1,220 @@
+# app/tenants.py
+import threading
+import time
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import telebot
+from flask import current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import MetaData, inspect, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateTable
+
+from app.models import db, Tenant, User, Booking, PromoCode
+
+# Tabelle partizionate per tenant
+TENANT_MODELS = (User, Booking, PromoCode)
+
+# Chiave del lock advisory di Postgres per la migrazione
+MIGRATION_LOCK_ID = 2916029
+
+# Cache LRU dei client TeleBot, indicizzata per token
+_bot_cache = OrderedDict()
+_bot_cache_lock = threading.Lock()
+
+# Cache host -> tenant: le sedi cambiano raramente, evita una query per richiesta
+TENANT_CACHE_MAXSIZE = 256
+_tenant_cache = OrderedDict()
+_tenant_cache_lock = threading.Lock()
+
+
+def get_bot(token):
+    """Ritorna il client TeleBot per il token, da una cache LRU limitata"""
+    maxsize = current_app.config.get("TENANT_BOT_CACHE_SIZE", 32) if has_app_context() else 32
+    with _bot_cache_lock:
+        bot = _bot_cache.get(token)
+        if bot is not None:
+            _bot_cache.move_to_end(token)
+            return bot
+        # threaded=False: nessun ThreadPool per bot, le risposte partono dal worker della richiesta
+        bot = telebot.TeleBot(token, threaded=False)
+        _bot_cache[token] = bot
+        while len(_bot_cache) > maxsize:
+            _bot_cache.popitem(last=False)
+        return bot
+
+
+def get_default_tenant():
+    return Tenant.query.filter_by(slug=current_app.config["DEFAULT_TENANT_SLUG"]).first()
+
+
+def _snapshot(tenant):
+    """Copia in sola lettura delle colonne del tenant, valida fuori dalla sessione"""
+    if tenant is None:
+        return None
+    return SimpleNamespace(**{c.name: getattr(tenant, c.name) for c in Tenant.__table__.columns})
+
+
+def _resolve_tenant():
+    host = request.host.split(":")[0].lower() if has_request_context() else None
+    now = time.monotonic()
+    with _tenant_cache_lock:
+        cached = _tenant_cache.get(host)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    tenant = (host and Tenant.query.filter_by(host=host).first()) or get_default_tenant()
+    tenant = _snapshot(tenant)
+    ttl = current_app.config.get("TENANT_CACHE_SECONDS", 60)
+    with _tenant_cache_lock:
+        _tenant_cache[host] = (now + ttl, tenant)
+        _tenant_cache.move_to_end(host)
+        # Host arbitrari nell'header non devono far crescere la cache
+        while len(_tenant_cache) > TENANT_CACHE_MAXSIZE:
+            _tenant_cache.popitem(last=False)
+    return tenant
+
+
+def clear_tenant_cache():
+    with _tenant_cache_lock:
+        _tenant_cache.clear()
+
+
+def current_tenant():
+    """Ritorna il tenant della richiesta corrente (dal dominio, altrimenti quello di default)"""
+    if "tenant" not in g:
+        g.tenant = _resolve_tenant()
+    return g.tenant
+
+
+def tenant_query(model):
+    """Query su model filtrata per il tenant corrente"""
+    return model.query.filter_by(tenant_id=current_tenant().id)
+
+
+def ensure_default_tenant():
+    """Crea il tenant di default e lo allinea con la Config"""
+    config = current_app.config
+    tenant = get_default_tenant()
+    if not tenant:
+        try:
+            db.session.add(Tenant(slug=config["DEFAULT_TENANT_SLUG"], name="Gustino SPA"))
+            db.session.commit()
+        except IntegrityError:
+            # Un altro worker lo ha creato nello stesso momento
+            db.session.rollback()
+        tenant = get_default_tenant()
+
+    tenant.bot_token = config.get("TELEGRAM_BOT_TOKEN") or tenant.bot_token
+    tenant.bot_username = config.get("TELEGRAM_BOT_USERNAME") or tenant.bot_username
+    tenant.owner_chat_id = config.get("OWNER_CHAT_ID") or tenant.owner_chat_id
+    tenant.special_code = config.get("SPECIAL_CODE") or tenant.special_code
+    db.session.commit()
+    return tenant
+
+
+def _legacy_uniques(inspector, table_name):
+    """Vincoli e indici UNIQUE globali (senza tenant_id) dello schema single-tenant"""
+    constraints = [
+        uc["name"] for uc in inspector.get_unique_constraints(table_name)
+        if "tenant_id" not in uc["column_names"]
+    ]
+    indexes = [
+        ix["name"] for ix in inspector.get_indexes(table_name)
+        if ix.get("unique") and "tenant_id" not in ix["column_names"]
+        and not ix.get("duplicates_constraint")
+    ]
+    return constraints, indexes
+
+
+def _table_outdated(inspector, table_name):
+    columns = {c["name"]: c for c in inspector.get_columns(table_name)}
+    tenant_column = columns.get("tenant_id")
+    constraints, indexes = _legacy_uniques(inspector, table_name)
+    return tenant_column is None or tenant_column["nullable"] or bool(constraints or indexes)
+
+
+def tenant_schema_outdated():
+    """True se le tabelle sono ancora nello schema precedente al multi-tenant"""
+    inspector = inspect(db.engine)
+    return any(
+        inspector.has_table(model.__table__.name) and _table_outdated(inspector, model.__table__.name)
+        for model in TENANT_MODELS
+    )
+
+
+def _migrate_postgres_table(conn, inspector, table, tenant_id):
+    name = table.name
+    if "tenant_id" not in {c["name"] for c in inspector.get_columns(name)}:
+        conn.execute(text(f'ALTER TABLE "{name}" ADD COLUMN tenant_id INTEGER REFERENCES tenant(id)'))
+    conn.execute(text(f'UPDATE "{name}" SET tenant_id = :tenant_id WHERE tenant_id IS NULL'), {"tenant_id": tenant_id})
+    conn.execute(text(f'ALTER TABLE "{name}" ALTER COLUMN tenant_id SET NOT NULL'))
+
+    constraints, indexes = _legacy_uniques(inspector, name)
+    for constraint in constraints:
+        conn.execute(text(f'ALTER TABLE "{name}" DROP CONSTRAINT "{constraint}"'))
+    for index in indexes:
+        conn.execute(text(f'DROP INDEX "{index}"'))
+
+
+def _migrate_sqlite_table(conn, inspector, table, tenant_id):
+    # SQLite non permette di rimuovere vincoli o impostare NOT NULL: ricrea la tabella
+    name = table.name
+    existing = {c["name"] for c in inspector.get_columns(name)}
+
+    metadata = MetaData()
+    for model in (Tenant,) + TENANT_MODELS:
+        model.__table__.to_metadata(metadata)
+    new_table = table.to_metadata(metadata, name=f"_new_{name}")
+    conn.execute(CreateTable(new_table))
+
+    columns = [c.name for c in table.columns if c.name != "tenant_id" and c.name in existing]
+    tenant_expr = "COALESCE(tenant_id, :tenant_id)" if "tenant_id" in existing else ":tenant_id"
+    column_list = ", ".join(f'"{c}"' for c in columns)
+    conn.execute(
+        text(f'INSERT INTO "_new_{name}" ({column_list}, tenant_id) SELECT {column_list}, {tenant_expr} FROM "{name}"'),
+        {"tenant_id": tenant_id},
+    )
+    conn.execute(text(f'DROP TABLE "{name}"'))
+    conn.execute(text(f'ALTER TABLE "_new_{name}" RENAME TO "{name}"'))
+
+
+def migrate_tenant_schema():
+    """Porta le tabelle create prima del multi-tenant allo schema dei modelli.
+
+    Aggiunge tenant_id (NOT NULL, valorizzato con il tenant di default) e
+    rimuove i vincoli UNIQUE globali su chat_id e code. Va eseguita una sola
+    volta prima di avviare i worker (flask tenant migrate); su SQLite la
+    esegue create_app all'avvio.
+    """
+    tenant_id = ensure_default_tenant().id
+    db.session.remove()
+    migrated = []
+
+    with db.engine.connect() as conn:
+        dialect = conn.dialect.name
+        if dialect == "sqlite":
+            # Fuori da una transazione: DROP TABLE non deve toccare le foreign key
+            conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            conn.commit()
+        with conn.begin():
+            if dialect == "postgresql":
+                # Una sola migrazione alla volta anche con più processi
+                conn.exec_driver_sql(f"SELECT pg_advisory_xact_lock({MIGRATION_LOCK_ID})")
+            inspector = inspect(conn)
+            for model in TENANT_MODELS:
+                table = model.__table__
+                if not inspector.has_table(table.name) or not _table_outdated(inspector, table.name):
+                    continue
+                print(f"🔧 Migrazione multi-tenant di {table.name}")
+                if dialect == "sqlite":
+                    _migrate_sqlite_table(conn, inspector, table, tenant_id)
+                else:
+                    _migrate_postgres_table(conn, inspector, table, tenant_id)
+                migrated.append(table.name)
+                inspector = inspect(conn)
+
+    for model in TENANT_MODELS:
+        for index in model.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+    return migrated
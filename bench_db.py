@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark di concorrenza per la configurazione dell'engine del database.
+Confronta le opzioni di default con quelle di app/database.py
+(pool, pre-ping, WAL, busy_timeout, synchronous=NORMAL) su SQLite.
+
+Uso:
+  python3 bench_db.py [--threads 16] [--ops 50] [--url sqlite:///bench.db]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from flask import Flask
+from sqlalchemy.exc import OperationalError
+
+from app.models import db, Tenant, User, Booking
+from app.database import configure_engine, register_engine_events, get_pool_stats
+from config import Config
+
+
+def make_app(url, tuned):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config["SQLALCHEMY_DATABASE_URI"] = url
+    if tuned:
+        configure_engine(app)
+    db.init_app(app)
+    with app.app_context():
+        if tuned:
+            register_engine_events(app, db.engine)
+        db.create_all()
+        tenant = Tenant(slug="bench")
+        db.session.add(tenant)
+        db.session.flush()
+        db.session.add(User(tenant_id=tenant.id, chat_id="bench", name="Bench"))
+        db.session.commit()
+    return app
+
+
+def worker(app, ops, latencies, errors):
+    with app.app_context():
+        user = User.query.filter_by(chat_id="bench").first()
+        for i in range(ops):
+            start = time.perf_counter()
+            try:
+                db.session.add(Booking(tenant_id=user.tenant_id, user_id=user.id, date="2025-01-01", time=f"{i % 24}:00"))
+                db.session.commit()
+                Booking.query.filter_by(user_id=user.id).count()
+                latencies.append(time.perf_counter() - start)
+            except OperationalError as e:
+                db.session.rollback()
+                errors.append(str(e.orig))
+        db.session.remove()
+
+
+def run(label, url, tuned, threads, ops):
+    app = make_app(url, tuned)
+    latencies, errors = [], []
+    workers = [threading.Thread(target=worker, args=(app, ops, latencies, errors)) for _ in range(threads)]
+
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0
+    locked = sum(1 for e in errors if "locked" in e)
+    print(f"\n[{label}]")
+    print(f"  ok: {len(latencies)}  errori: {len(errors)} (database is locked: {locked})")
+    print(f"  throughput: {len(latencies) / elapsed:.1f} op/s  p95: {p95:.1f} ms")
+    with app.app_context():
+        if tuned:
+            stats = get_pool_stats(db.engine)
+            print(f"  pool: {stats['status']}")
+            print(f"  picco connessioni in uso: {stats['metrics']['peak_checked_out']}")
+        db.drop_all()
+        db.engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--ops", type=int, default=50)
+    parser.add_argument("--url", help="URL del database (default: file SQLite temporaneo)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"GUSTINO SPA - DB concurrency benchmark ({args.threads} thread x {args.ops} op)")
+    print("=" * 60)
+
+    for label, tuned in (("default", False), ("tuned", True)):
+        if args.url:
+            url = args.url
+        else:
+            path = os.path.join(tempfile.mkdtemp(), f"bench_{label}.db")
+            url = f"sqlite:///{path}"
+        # Ogni run crea una nuova app Flask, quindi un engine separato
+        run(label, url, tuned, args.threads, args.ops)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
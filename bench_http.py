@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark delle risposte HTTP: byte trasmessi e CPU del server per richiesta,
+con e senza compressione, per le pagine HTML e le API di polling.
+
+Uso:
+  python3 bench_http.py [--requests 200]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Ambiente isolato: database temporaneo, nessun polling Telegram
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "123456:bench")
+os.environ["USE_WEBHOOK"] = "true"
+os.environ.pop("WEBHOOK_URL", None)
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_http.db')}"
+
+from app import create_app
+from app.models import db, User
+from app.tenants import get_default_tenant
+
+ENDPOINTS = [
+    "/",
+    "/wait-for-chatid",
+    "/booking/1",
+    "/check-promo-code?code=BENCH",
+    "/check-chatid",
+]
+
+ENCODINGS = [
+    ("identity", "identity"),
+    ("gzip", "gzip"),
+    ("br", "br, gzip"),
+]
+
+
+def measure(client, path, accept_encoding, requests):
+    headers = {"Accept-Encoding": accept_encoding}
+    size = 0
+    encoding = "identity"
+    start = time.process_time()
+    for _ in range(requests):
+        response = client.get(path, headers=headers)
+        size = len(response.get_data())
+        encoding = response.headers.get("Content-Encoding", "identity")
+    cpu_ms = (time.process_time() - start) / requests * 1000
+    return size, encoding, cpu_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        tenant = get_default_tenant()
+        db.session.add(User(tenant_id=tenant.id, chat_id="bench", name="Bench", code_used="BENCH"))
+        db.session.commit()
+
+    client = app.test_client()
+
+    print("=" * 72)
+    print(f"GUSTINO SPA - HTTP response benchmark ({args.requests} richieste per riga)")
+    print(f"JSON provider: {type(app.json).__name__}  template: {app.template_folder}")
+    print("=" * 72)
+    print(f"{'endpoint':<30} {'accept':<9} {'encoding':<9} {'bytes':>7} {'cpu ms/req':>11}")
+
+    for path in ENDPOINTS:
+        for label, accept_encoding in ENCODINGS:
+            size, encoding, cpu_ms = measure(client, path, accept_encoding, args.requests)
+            print(f"{path:<30} {label:<9} {encoding:<9} {size:>7} {cpu_ms:>11.3f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
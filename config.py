@@ -13,19 +13,58 @@ class Config:
         DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
     
     SQLALCHEMY_DATABASE_URI = DATABASE_URL
+
+    # Repliche in sola lettura (separate da virgola), vedi app/db_routing.py
+    DATABASE_REPLICA_URLS = [
+        url.strip().replace("postgres://", "postgresql://", 1)
+        for url in os.environ.get("DATABASE_REPLICA_URLS", "").split(",")
+        if url.strip()
+    ]
+    # Dopo un commit, le letture dello stesso utente restano sul primario
+    DB_REPLICA_STICKY_SECONDS = int(os.environ.get("DB_REPLICA_STICKY_SECONDS", "5"))
+    DB_READ_STATEMENT_TIMEOUT_MS = int(os.environ.get("DB_READ_STATEMENT_TIMEOUT_MS", "2000"))
     
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Database engine (pool di connessioni, vedi app/database.py)
+    DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = int(os.environ.get("DB_POOL_TIMEOUT", "30"))
+    # Render Postgres chiude le connessioni inattive: ricicla prima che scadano
+    DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "280"))
+    DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true"
+
+    # SQLite (sviluppo locale)
+    SQLITE_WAL = os.environ.get("SQLITE_WAL", "true").lower() == "true"
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_SYNCHRONOUS = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+    SQLITE_FOREIGN_KEYS = os.environ.get("SQLITE_FOREIGN_KEYS", "false").lower() == "true"
+
     # Telegram
     TELEGRAM_BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN")
     TELEGRAM_BOT_USERNAME = os.environ.get("TELEGRAM_BOT_USERNAME", "gustinospa_bot")
     OWNER_CHAT_ID = os.environ.get("OWNER_CHAT_ID")
     OWNER_EMAIL = os.environ.get("OWNER_EMAIL", "owner@example.com")
 
+    # Multi-tenant: il tenant di default usa TELEGRAM_BOT_TOKEN, OWNER_CHAT_ID e SPECIAL_CODE
+    DEFAULT_TENANT_SLUG = os.environ.get("DEFAULT_TENANT_SLUG", "default")
+    # Numero massimo di client TeleBot tenuti in memoria (LRU)
+    TENANT_BOT_CACHE_SIZE = int(os.environ.get("TENANT_BOT_CACHE_SIZE", "32"))
+    # Secondi di validità della cache dominio -> tenant
+    TENANT_CACHE_SECONDS = int(os.environ.get("TENANT_CACHE_SECONDS", "60"))
+
     # Promo codes
     SPECIAL_CODE = os.environ.get("SPECIAL_CODE", "NINNIPINNI")
     DEFAULT_PROMO_CODES = os.environ.get("INITIAL_CODES", f"GUSTINO2025,{SPECIAL_CODE},VIP2025").split(",")
     VALID_CODE = os.environ.get("promo", SPECIAL_CODE)
 
+    # Risposte HTTP: compressione gzip/brotli (vedi app/responses.py)
+    COMPRESS_RESPONSES = os.environ.get("COMPRESS_RESPONSES", "true").lower() == "true"
+    COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", "500"))
+    COMPRESS_LEVEL = int(os.environ.get("COMPRESS_LEVEL", "6"))
+    COMPRESS_BR_QUALITY = int(os.environ.get("COMPRESS_BR_QUALITY", "4"))
+    # Template con CSS/JS inline minificati da minify_templates.py (build)
+    MINIFIED_TEMPLATES = os.environ.get("MINIFIED_TEMPLATES", "false").lower() == "true"
+
     # Logging
     LOG_PATH = os.environ.get("LOG_PATH", "app.log")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Minifica CSS e JS inline dei template (step di build).
+Legge app/templates/*.html e scrive app/templates_min/; l'app usa i
+template minificati quando MINIFIED_TEMPLATES=true.
+
+La minificazione è conservativa: i tag Jinja e l'HTML restano invariati,
+il JS mantiene gli a capo (nessun rischio con l'inserimento automatico
+dei punto e virgola).
+"""
+
+import os
+import re
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BASE_DIR, "app", "templates")
+DST_DIR = os.path.join(BASE_DIR, "app", "templates_min")
+
+STYLE_RE = re.compile(r"(<style[^>]*>)(.*?)(</style>)", re.S | re.I)
+SCRIPT_RE = re.compile(r"(<script(?![^>]*\bsrc=)[^>]*>)(.*?)(</script>)", re.S | re.I)
+
+
+def minify_css(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    css = css.replace(";}", "}")
+    return css.strip()
+
+
+def minify_js(js):
+    lines = []
+    for line in js.splitlines():
+        line = line.strip()
+        # Solo commenti su riga intera o dopo ; { } ) (mai dentro stringhe o URL)
+        if not line or line.startswith("//"):
+            continue
+        line = re.sub(r"([;{})])\s+//[^'\"`]*$", r"\1", line)
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def minify_template(html):
+    html = STYLE_RE.sub(lambda m: m.group(1) + minify_css(m.group(2)) + m.group(3), html)
+    html = SCRIPT_RE.sub(lambda m: m.group(1) + minify_js(m.group(2)) + m.group(3), html)
+    return html
+
+
+def main():
+    os.makedirs(DST_DIR, exist_ok=True)
+    total_before = total_after = 0
+
+    for name in sorted(os.listdir(SRC_DIR)):
+        if not name.endswith(".html"):
+            continue
+        with open(os.path.join(SRC_DIR, name), encoding="utf-8") as f:
+            html = f.read()
+        minified = minify_template(html)
+        with open(os.path.join(DST_DIR, name), "w", encoding="utf-8") as f:
+            f.write(minified)
+
+        before, after = len(html.encode("utf-8")), len(minified.encode("utf-8"))
+        total_before += before
+        total_after += after
+        print(f"  {name}: {before} -> {after} bytes")
+
+    print(f"Totale: {total_before} -> {total_after} bytes ({DST_DIR})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
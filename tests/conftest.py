@@ -0,0 +1,21 @@
+import os
+
+import pytest
+
+# Importare app richiede un token Telegram (app/telegram_polling.py)
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "123456:test")
+
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    """Crea un'app su un database SQLite temporaneo, senza avviare il bot"""
+    from app import create_app
+    from app.tenants import clear_tenant_cache
+    from config import Config
+
+    def factory(name="app.db"):
+        monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / name}")
+        clear_tenant_cache()
+        return create_app(start_bot=False)
+
+    return factory
@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from app.models import db, Tenant, User
+from app.tenants import get_default_tenant
+
+
+def _invoke(app, *args):
+    result = app.test_cli_runner().invoke(args=list(args))
+    assert result.exit_code == 0, result.output
+    return result
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_empty_string_and_null_stay_distinct(make_app, tmp_path, fmt):
+    source = make_app("source.db")
+    with source.app_context():
+        db.session.add(User(tenant_id=get_default_tenant().id, chat_id="100", name="", code_used=None))
+        db.session.commit()
+
+    path = str(tmp_path / f"user.{fmt}")
+    _invoke(source, "data", "export", "user", path)
+
+    target = make_app("target.db")
+    _invoke(target, "data", "import", "user", path)
+
+    with target.app_context():
+        user = User.query.filter_by(chat_id="100").one()
+        assert user.name == ""
+        assert user.code_used is None
+
+
+def test_tenant_import_without_bot_token_keeps_stored_token(make_app, tmp_path):
+    app = make_app()
+    with app.app_context():
+        db.session.add(Tenant(slug="roma", name="Roma", host="roma.example", bot_token="42:secret"))
+        db.session.commit()
+
+    path = tmp_path / "tenant.jsonl"
+    _invoke(app, "data", "export", "tenant", str(path))
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert all("bot_token" not in record for record in records)
+
+    # Modifica il nome nel backup e reimporta: il token salvato non cambia
+    for record in records:
+        if record["slug"] == "roma":
+            record["name"] = "Roma Centro"
+    path.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+    _invoke(app, "data", "import", "tenant", str(path))
+
+    with app.app_context():
+        tenant = Tenant.query.filter_by(slug="roma").one()
+        assert tenant.name == "Roma Centro"
+        assert tenant.bot_token == "42:secret"
@@ -0,0 +1,37 @@
+import pytest
+from flask import Flask, flash, get_flashed_messages, jsonify, redirect
+
+pytest.importorskip("orjson")
+
+from app.responses import OrjsonProvider, init_responses
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.secret_key = "test"
+    init_responses(app)
+
+    @app.route("/flash")
+    def set_flash():
+        flash("✅ Prenotazione completata!")
+        return redirect("/messages")
+
+    @app.route("/messages")
+    def messages():
+        return jsonify(get_flashed_messages())
+
+    return app
+
+
+def test_orjson_provider_is_used(app):
+    assert isinstance(app.json, OrjsonProvider)
+
+
+def test_flash_round_trips_through_session_cookie(app):
+    client = app.test_client()
+    assert client.get("/flash").status_code == 302
+
+    response = client.get("/messages")
+    assert response.status_code == 200
+    assert response.get_json() == ["✅ Prenotazione completata!"]
@@ -0,0 +1,135 @@
+import sqlite3
+
+from sqlalchemy import inspect
+
+from app.models import db, Booking, PromoCode, Tenant, User
+from app.tenants import (
+    TENANT_MODELS,
+    _legacy_uniques,
+    get_default_tenant,
+    migrate_tenant_schema,
+    tenant_schema_outdated,
+)
+
+
+def _add_tenant(slug, host):
+    tenant = Tenant(slug=slug, name=slug.title(), host=host, bot_token="42:secret")
+    db.session.add(tenant)
+    db.session.flush()
+    return tenant
+
+
+def test_reset_db_only_deletes_current_tenant_data(make_app):
+    app = make_app()
+    with app.app_context():
+        default = get_default_tenant()
+        roma = _add_tenant("roma", "roma.example")
+        for tenant in (default, roma):
+            user = User(tenant_id=tenant.id, chat_id="100", name=tenant.slug)
+            db.session.add(user)
+            db.session.flush()
+            db.session.add(Booking(tenant_id=tenant.id, user_id=user.id, date="2025-01-01", time="10:00"))
+        db.session.commit()
+
+    response = app.test_client().get("/reset-db", headers={"Host": "roma.example"})
+    assert response.status_code == 200
+
+    with app.app_context():
+        roma = Tenant.query.filter_by(slug="roma").one()
+        assert roma.bot_token == "42:secret"
+        assert User.query.filter_by(tenant_id=roma.id).count() == 0
+        assert Booking.query.filter_by(tenant_id=roma.id).count() == 0
+
+        default = get_default_tenant()
+        assert User.query.filter_by(tenant_id=default.id).count() == 1
+        assert Booking.query.filter_by(tenant_id=default.id).count() == 1
+
+
+def _create_legacy_schema(path):
+    """Schema single-tenant (prima di tenant_id) con un po' di dati"""
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE user (
+            id INTEGER PRIMARY KEY,
+            chat_id VARCHAR(50) NOT NULL UNIQUE,
+            name VARCHAR(100),
+            code_used VARCHAR(50)
+        );
+        CREATE TABLE booking (
+            id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES user(id),
+            date VARCHAR(50),
+            time VARCHAR(50),
+            service VARCHAR(100)
+        );
+        CREATE TABLE promo_code (
+            id INTEGER PRIMARY KEY,
+            code VARCHAR(50) NOT NULL UNIQUE,
+            used BOOLEAN,
+            created_at DATETIME
+        );
+        INSERT INTO user VALUES (1, '100', 'Mario', 'PROMO1');
+        INSERT INTO booking VALUES (1, 1, '2025-01-01', '10:00', 'Massaggio');
+        INSERT INTO promo_code VALUES (1, 'PROMO1', 1, '2025-01-01 09:00:00');
+    """)
+    conn.commit()
+    conn.close()
+
+
+def test_legacy_sqlite_schema_is_migrated(make_app, tmp_path):
+    _create_legacy_schema(tmp_path / "legacy.db")
+    # Su SQLite create_app esegue la migrazione all'avvio
+    app = make_app("legacy.db")
+
+    with app.app_context():
+        inspector = inspect(db.engine)
+        for model in TENANT_MODELS:
+            name = model.__table__.name
+            columns = {c["name"]: c for c in inspector.get_columns(name)}
+            assert columns["tenant_id"]["nullable"] is False
+            assert _legacy_uniques(inspector, name) == ([], [])
+
+        indexes = {ix["name"]: ix for name in ("user", "booking", "promo_code") for ix in inspector.get_indexes(name)}
+        assert indexes["ix_user_tenant_chat_id"]["unique"]
+        assert indexes["ix_user_tenant_chat_id"]["column_names"] == ["tenant_id", "chat_id"]
+        assert indexes["ix_promo_code_tenant_code"]["unique"]
+        assert "ix_user_tenant_code_used" in indexes
+        assert "ix_booking_tenant_user_id" in indexes
+
+        # I dati esistenti passano al tenant di default
+        default = get_default_tenant()
+        assert User.query.one().tenant_id == default.id
+        assert Booking.query.one().service == "Massaggio"
+        assert PromoCode.query.one().tenant_id == default.id
+
+        assert not tenant_schema_outdated()
+        assert migrate_tenant_schema() == []
+
+
+def test_hosts_resolve_to_isolated_tenants(make_app, monkeypatch):
+    monkeypatch.setattr("app.routes.register.tg_send", lambda *args, **kwargs: None)
+    app = make_app()
+    with app.app_context():
+        _add_tenant("roma", "roma.example")
+        db.session.commit()
+
+    client = app.test_client()
+    default_host = {"Host": "localhost"}
+    roma_host = {"Host": "roma.example"}
+
+    # Lo stesso chat_id si può registrare in entrambe le sedi
+    client.post("/register?promo_code=CENTRO", data={"chat_id": "100", "name": "Centro"}, headers=default_host)
+    client.post("/register?promo_code=ROMA", data={"chat_id": "100", "name": "Roma"}, headers=roma_host)
+
+    with app.app_context():
+        users = {u.name: u for u in User.query.all()}
+        assert users["Centro"].tenant_id != users["Roma"].tenant_id
+        roma_user_id = users["Roma"].id
+
+    assert client.get("/check-promo-code?code=ROMA", headers=roma_host).json["exists"]
+    assert not client.get("/check-promo-code?code=ROMA", headers=default_host).json["exists"]
+    assert not client.get("/check-promo-code?code=CENTRO", headers=roma_host).json["exists"]
+
+    assert client.get(f"/booking/{roma_user_id}", headers=roma_host).status_code == 200
+    # Un utente di un'altra sede non viene trovato
+    assert client.get(f"/booking/{roma_user_id}", headers=default_host).status_code == 302